@@ -0,0 +1,148 @@
+import argparse
+import hashlib
+import itertools
+import json
+import os
+
+import numpy as np
+from prepare_data import PREPARED_DATA_PATH, SOURCE_FILES, load_prepared, prepare
+from scoring import DEFAULT_SCORING_CONFIG, SCORING_CONFIG_PATH
+
+FEATURES_PATH = "data/calibration_features.npz"
+FEATURE_COLUMNS = ["factual_accuracy", "similarity", "completeness", "word_count_actual", "word_count_student", "contradictions"]
+
+# Search space for the penalties; weights are searched on a simplex grid
+LENGTH_FACTORS = np.round(np.arange(0.4, 0.85, 0.05), 2)
+CONTRADICTION_PENALTIES = np.round(np.arange(0.5, 1.01, 0.05), 2)
+WEIGHT_STEP = 0.05
+
+def load_pairs(files):
+    """Load labelled data as interned texts plus unique (reference, student) pairs with a mean score."""
+    if files == [PREPARED_DATA_PATH]:
+        return load_prepared(PREPARED_DATA_PATH)
+    return prepare(files)
+
+def compute_features(prepared):
+    """Analyze each unique text once, then compare the analyses per pair; returns columnar features."""
+    from model import get_interned_components
+
+    print(f"Analyzing {len(prepared['reference_clean'])} reference and {len(prepared['student_clean'])} student answers...")
+    pairs = get_interned_components(
+        prepared["reference_clean"].tolist(), prepared["student_clean"].tolist(),
+        prepared["reference_index"], prepared["student_index"],
+    )
+    columns = {name: np.empty(len(pairs)) for name in FEATURE_COLUMNS}
+    for i, components in enumerate(pairs):
+        components["contradictions"] = len(components["contradictions"])
+        for name in FEATURE_COLUMNS:
+            columns[name][i] = components[name]
+    return columns
+
+def fingerprint(files):
+    """Content hash of the data files, so edited or regenerated data invalidates the cache."""
+    digest = hashlib.sha256()
+    for f in sorted(files):
+        digest.update(f.encode("utf-8"))
+        with open(f, "rb") as data:
+            digest.update(hashlib.sha256(data.read()).digest())
+    return digest.hexdigest()
+
+def load_features(files, path=FEATURES_PATH, refresh=False):
+    """Return cached features for the given data files, computing them on a cache miss."""
+    source_fingerprint = fingerprint(files)
+    if not refresh and os.path.exists(path):
+        with np.load(path, allow_pickle=False) as cached:
+            if "fingerprint" in cached.files and "count" in cached.files and str(cached["fingerprint"]) == source_fingerprint:
+                print(f"✅ Loaded cached features from {path}")
+                return {name: cached[name] for name in FEATURE_COLUMNS + ["score", "count"]}
+        print(f"Data files changed since {path} was written, recomputing")
+
+    prepared = load_pairs(files)
+    print(f"Computing features for {len(prepared['score'])} unique pairs...")
+    columns = compute_features(prepared)
+    columns["score"] = prepared["score"].astype(float)
+    # Labelled rows behind each unique pair, so errors are weighted like the original data
+    columns["count"] = prepared["count"].astype(float)
+    np.savez_compressed(path, files=np.array(files), fingerprint=np.array(source_fingerprint), **columns)
+    print(f"✅ Cached features to {path}")
+    return columns
+
+def simplex_grid(step=WEIGHT_STEP):
+    """All [factual, semantic, completeness] weight vectors on a grid that sum to 1."""
+    n = int(round(1 / step))
+    return np.array([(a, b, n - a - b) for a, b in itertools.product(range(n + 1), repeat=2) if a + b <= n]) / n
+
+def score_multiplier(features, config, length_factor, contradiction_penalty):
+    """Vectorized length and contradiction penalties, mirroring model.combine_components."""
+    length_ratio = np.minimum(
+        features["word_count_student"] / np.maximum(features["word_count_actual"] * length_factor, 1),
+        config["length_cap"],
+    )
+    multiplier = np.where(length_ratio < config["length_penalty_threshold"], length_ratio, 1.0)
+    return multiplier * np.where(features["contradictions"] > 0, contradiction_penalty, 1.0)
+
+def length_buckets(features, config):
+    word_count_actual = features["word_count_actual"]
+    short = word_count_actual <= config["short_max_words"]
+    medium = ~short & (word_count_actual <= config["medium_max_words"])
+    return {"short": short, "medium": medium, "long": ~short & ~medium}
+
+def evaluate_config(features, config):
+    """Mean squared error of a scoring config against the labelled scores, per labelled row."""
+    components = np.stack([features["factual_accuracy"], features["similarity"], features["completeness"]], axis=1)
+    weights = np.empty_like(components)
+    for bucket, mask in length_buckets(features, config).items():
+        weights[mask] = config["weights"][bucket]
+    predicted = (components * weights).sum(axis=1)
+    predicted *= score_multiplier(features, config, config["length_factor"], config["contradiction_penalty"])
+    return float(np.average((predicted - features["score"]) ** 2, weights=features["count"]))
+
+def search(features, config):
+    """Grid search the penalties and, for each setting, the best simplex weights per length bucket."""
+    components = np.stack([features["factual_accuracy"], features["similarity"], features["completeness"]], axis=1)
+    candidates = simplex_grid()
+    buckets = length_buckets(features, config)
+    best_error, best = np.inf, None
+
+    for length_factor, contradiction_penalty in itertools.product(LENGTH_FACTORS, CONTRADICTION_PENALTIES):
+        multiplier = score_multiplier(features, config, length_factor, contradiction_penalty)
+        total_error = 0.0
+        weights = {}
+        for bucket, mask in buckets.items():
+            if not mask.any():
+                weights[bucket] = config["weights"][bucket]
+                continue
+            # (candidates, pairs) predictions for every weight vector at once
+            predicted = (candidates @ components[mask].T) * multiplier[mask]
+            errors = (((predicted - features["score"][mask]) ** 2) * features["count"][mask]).sum(axis=1)
+            index = int(np.argmin(errors))
+            weights[bucket] = [round(float(w), 3) for w in candidates[index]]
+            total_error += float(errors[index])
+        if total_error < best_error:
+            best_error = total_error
+            best = {"weights": weights, "length_factor": float(length_factor), "contradiction_penalty": float(contradiction_penalty)}
+
+    return {**config, **best}
+
+def calibrate():
+    parser = argparse.ArgumentParser(description="Fit scoring weights to the labelled data.")
+    parser.add_argument("files", nargs="*", help="Labelled CSV files (default: prepared data if present)")
+    parser.add_argument("--features", default=FEATURES_PATH, help="Cached feature file (.npz)")
+    parser.add_argument("--output", default=SCORING_CONFIG_PATH, help="Scoring config to write")
+    parser.add_argument("--refresh", action="store_true", help="Recompute cached features")
+    args = parser.parse_args()
+
+    if not args.files:
+        args.files = [PREPARED_DATA_PATH] if os.path.exists(PREPARED_DATA_PATH) else SOURCE_FILES
+    features = load_features(args.files, args.features, args.refresh)
+    config = search(features, DEFAULT_SCORING_CONFIG)
+
+    print(f"Default config MSE:    {evaluate_config(features, DEFAULT_SCORING_CONFIG):.4f}")
+    print(f"Calibrated config MSE: {evaluate_config(features, config):.4f}")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+    print(f"✅ Scoring config written to {args.output}")
+
+if __name__ == "__main__":
+    calibrate()
@@ -0,0 +1,70 @@
+# Production launch for the /evaluate API (main.app).
+#
+#   gunicorn main:app                 # picks up this file automatically
+#   python serve.py --workers 4       # same, via serve.py
+#
+# The app is imported once in the master process (preload_app), so MiniLM and
+# spaCy are loaded before the workers are forked and their weights are shared
+# copy-on-write. Each worker gets its own slice of CPU threads for torch.
+#
+# Settings (environment variables):
+#   HOST, PORT           bind address (default 0.0.0.0:8000)
+#   WEB_CONCURRENCY      number of workers (default 2; -w/--workers overrides)
+#   TORCH_THREADS        torch threads per worker (default CPUs / workers)
+#   MAX_REQUESTS         recycle a worker after this many requests (default 0, off)
+#
+# Restarts: because the app is preloaded, `kill -HUP <master pid>` only re-reads
+# this config and re-forks the workers from the master's already-loaded code and
+# models; it does NOT pick up new code. To deploy new code with no downtime:
+#   kill -USR2 <old master pid>   # re-exec a new master (loads new code + models)
+#   kill -WINCH <old master pid>  # old workers finish in-flight requests and exit
+#   kill -QUIT <old master pid>   # once the new workers are serving
+# With --pid set, USR2 moves the old master's pid to <pidfile>.oldbin.
+# `kill -TTIN` / `kill -TTOU` add or remove a worker at runtime.
+#
+# Memory per worker (Linux, /proc/<pid>/smaps_rollup, after 40 /evaluate calls;
+# torch 2.14.1, sentence-transformers 6.1.0, spaCy 3.8, 1 CPU):
+#
+#   preload_app  workers  master Pss  worker Pss  worker Private  total Pss
+#   True               1      626 MB      368 MB           88 MB     995 MB
+#   True               2      533 MB      248 MB           34 MB    1030 MB
+#   True               4      459 MB      160 MB           34 MB    1098 MB
+#   False              4       17 MB      649 MB          545 MB    2615 MB
+#
+# The master holds ~346 MB private (models and torch runtime); each extra
+# preloaded worker costs ~35 MB private instead of ~545 MB. These runs used
+# randomly initialised models with the exact architecture of all-MiniLM-L6-v2
+# (22.7M parameters) and an en_core_web_sm-style efficiency pipeline, since the
+# published weights could not be downloaded on the measuring host; re-measure
+# on the target with
+#   for p in $(pgrep -f "gunicorn main:app"); do grep -E "^(Rss|Pss|Private)" /proc/$p/smaps_rollup | tr '\n' ' '; echo " pid=$p"; done
+# Pss splits shared pages between the processes using them, so the sum of Pss
+# is the real footprint; Private_* is what each extra worker costs.
+import gc
+import multiprocessing
+import os
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+timeout = 120
+graceful_timeout = 30
+max_requests = int(os.environ.get("MAX_REQUESTS", 0))
+max_requests_jitter = max_requests // 10
+
+# The tokenizers thread pool is not fork-safe
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+def pre_fork(server, worker):
+    # Move the preloaded objects out of the GC's view so collections in the
+    # workers don't write to (and copy) the shared model pages
+    gc.freeze()
+
+def post_fork(server, worker):
+    # Split the CPUs between the workers actually running, so -w/--workers and
+    # TTIN/TTOU are taken into account, not just WEB_CONCURRENCY
+    import torch
+    torch_threads = int(os.environ.get("TORCH_THREADS", 0)) or max(1, multiprocessing.cpu_count() // server.num_workers)
+    torch.set_num_threads(torch_threads)
+    server.log.info(f"Worker {worker.pid} using {torch_threads} torch threads")
@@ -0,0 +1,302 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+import types
+from collections import defaultdict
+
+import bcrypt
+import httpx
+
+STUDENT_PASSWORD = "exam-day"
+DEPARTMENTS = [1, 2, 3, 4]
+EXAM_IDS = list(range(1, 21))
+
+# Exam-day traffic profile: a login burst (one login per student), then closed
+# loops of users picking endpoints by weight
+PHASES = [
+    ("detail_polling", {"exam_details": 0.7, "exams_by_department": 0.3}),
+    ("evaluation_spike", {"evaluate": 0.9, "exam_details": 0.1}),
+]
+
+EVALUATION_PAIRS = [
+    ("Water boils at 100 degrees Celsius at sea level.", "Water boils at 100°C at sea level."),
+    ("The capital of France is Paris.", "Paris is the capital city of France."),
+    ("The process of photosynthesis in plants involves the conversion of sunlight into chemical energy using chlorophyll.",
+     "Plants take in sunlight and turn it into food through a process called photosynthesis."),
+    ("World War 2 ended in 1945 after the surrender of Germany and Japan.", "WW2 ended in 1944."),
+]
+
+# === Local DB stand-in ===
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+    def all(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.first()
+
+class FakeSession:
+    """Answers the stored procedure calls made by auth.app with canned rows."""
+
+    def __init__(self, password_hash, latency):
+        self.password_hash = password_hash
+        self.latency = latency
+
+    def execute(self, statement, params=None):
+        time.sleep(self.latency)
+        sql = str(statement)
+        params = params or {}
+        if "login_user" in sql:
+            return FakeResult([{"user_id": 1, "email": params["email"], "role": "student", "password": self.password_hash}])
+        if "get_exam_details_by_id_json" in sql:
+            exam = {"exam_id": params["exam_id"], "title": "Physics", "duration_minutes": 60, "questions": [
+                {"question_text": f"Question {i}", "question_type": "descriptive", "marks": 5} for i in range(10)
+            ]}
+            return FakeResult([(json.dumps(exam),)])
+        if "get_exams_by_department_json" in sql:
+            exams = [{"exam_id": exam_id, "title": f"Exam {exam_id}"} for exam_id in EXAM_IDS]
+            return FakeResult([(json.dumps(exams),)])
+        return FakeResult([])
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+# === Stub SMTP ===
+class StubSMTP:
+    sent = 0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def login(self, user, password):
+        pass
+
+    def sendmail(self, from_addr, to_addr, message):
+        StubSMTP.sent += 1
+
+def stub_model_module():
+    """Cheap stand-in for model.py, to measure the API without MiniLM/spaCy."""
+    module = types.ModuleType("model")
+    module.get_similarity = lambda actual, student: (0.5, "🤔 Partially correct. Needs more specific details.")
+    return module
+
+def build_main_app(stub_model):
+    if stub_model:
+        sys.modules["model"] = stub_model_module()
+
+    import main
+    return main.app
+
+def build_auth_app(db_latency):
+    """Import auth.app with the DB dependency and SMTP replaced by local stand-ins."""
+    import auth
+    from dbConnection import get_db
+
+    password_hash = bcrypt.hashpw(STUDENT_PASSWORD.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+    def fake_get_db():
+        yield FakeSession(password_hash, db_latency)
+
+    auth.app.dependency_overrides[get_db] = fake_get_db
+    auth.smtplib.SMTP_SSL = StubSMTP
+    return auth.app
+
+def stub_auth_app():
+    """uvicorn factory for auth.app with the stand-ins, used by --serve-auth."""
+    return build_auth_app(float(os.environ.get("LOADTEST_DB_LATENCY", 0.002)))
+
+# === Requests ===
+def endpoint_request(name, rng):
+    """Return (app, path, payload) for one request to the named endpoint."""
+    if name == "exam_details":
+        return "auth", "/exam/details", {"exam_id": rng.choice(EXAM_IDS), "role": "student"}
+    if name == "exams_by_department":
+        return "auth", "/exams/by-department", {"department_id": rng.choice(DEPARTMENTS)}
+    actual, student_answer = rng.choice(EVALUATION_PAIRS)
+    return "main", "/evaluate", {"actual_answer": actual, "student_answer": student_answer}
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, name, latency, ok):
+        self.latencies[name].append(latency)
+        if not ok:
+            self.errors[name] += 1
+
+    def report(self, phase, elapsed):
+        rows = []
+        for name, latencies in sorted(self.latencies.items()):
+            latencies = sorted(latencies)
+            count = len(latencies)
+            rows.append({
+                "phase": phase,
+                "endpoint": name,
+                "requests": count,
+                "throughput_rps": round(count / elapsed, 2),
+                "error_rate": round(self.errors[name] / count, 4),
+                "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+                "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+                "max_ms": round(latencies[-1] * 1000, 1),
+            })
+        return rows
+
+def percentile(sorted_values, pct):
+    # Nearest-rank percentile
+    return sorted_values[max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)]
+
+async def timed_post(clients, stats, name, app, path, payload):
+    start = time.perf_counter()
+    try:
+        response = await clients[app].post(path, json=payload)
+        ok = response.status_code < 400
+    except Exception:
+        ok = False
+    stats.record(name, time.perf_counter() - start, ok)
+
+async def run_login_burst(clients, students, duration, otp_share, seed):
+    """Each student arrives once within `duration` (most right at exam start), optionally asks for an OTP, and logs in."""
+    stats = Stats()
+    rng = random.Random(seed)
+    # Triangular arrivals peaking at t=0: the rush at exam start, tailing off
+    arrivals = [(rng.triangular(0, duration, 0), rng.random() < otp_share) for _ in range(students)]
+
+    async def student(index, arrival, wants_otp):
+        await asyncio.sleep(max(0.0, start + arrival - time.perf_counter()))
+        email = f"student{index}@example.com"
+        if wants_otp:
+            await timed_post(clients, stats, "send_otp", "auth", "/send-otp", {"email": email})
+        await timed_post(clients, stats, "login", "auth", "/login", {"email": email, "password": STUDENT_PASSWORD})
+
+    start = time.perf_counter()
+    await asyncio.gather(*(student(i, arrival, wants_otp) for i, (arrival, wants_otp) in enumerate(arrivals)))
+    return stats, time.perf_counter() - start
+
+async def run_phase(clients, mix, duration, users, think_time, seed):
+    """Run `users` virtual users for `duration` seconds, each picking endpoints from `mix`."""
+    stats = Stats()
+    names, weights = list(mix), list(mix.values())
+    deadline = time.perf_counter() + duration
+
+    async def user(index):
+        rng = random.Random(seed * 100003 + index)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            app, path, payload = endpoint_request(name, rng)
+            await timed_post(clients, stats, name, app, path, payload)
+            if think_time:
+                await asyncio.sleep(rng.expovariate(1 / think_time))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user(i) for i in range(users)))
+    return stats, time.perf_counter() - start
+
+def make_client(name, url, build_app):
+    """Client for a running server at `url`, or for the app served in-process."""
+    limits = httpx.Limits(max_connections=None)
+    if url:
+        return httpx.AsyncClient(base_url=url, limits=limits, timeout=None)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=build_app()), base_url=f"http://{name}", limits=limits, timeout=None)
+
+async def run(args):
+    clients = {
+        "main": make_client("main", args.main_url, lambda: build_main_app(args.stub_model)),
+        "auth": make_client("auth", args.auth_url, lambda: build_auth_app(args.db_latency)),
+    }
+    settings = {
+        "detail_polling": (args.poll_duration, args.poll_users, args.poll_interval),
+        "evaluation_spike": (args.eval_duration, args.eval_users, 0),
+    }
+
+    rows = []
+    try:
+        if args.login_users > 0:
+            print(f"▶ login_burst: {args.login_users} students arriving over {args.login_duration}s")
+            stats, elapsed = await run_login_burst(clients, args.login_users, args.login_duration, args.otp_share, args.seed)
+            rows.extend(stats.report("login_burst", elapsed))
+        for index, (phase, mix) in enumerate(PHASES, start=1):
+            duration, users, think_time = settings[phase]
+            if duration <= 0 or users <= 0:
+                continue
+            print(f"▶ {phase}: {users} users for {duration}s")
+            stats, elapsed = await run_phase(clients, mix, duration, users, think_time, args.seed + index)
+            rows.extend(stats.report(phase, elapsed))
+    finally:
+        for client in clients.values():
+            await client.aclose()
+    return rows
+
+def print_report(rows):
+    columns = ["phase", "endpoint", "requests", "throughput_rps", "error_rate", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+    widths = {c: max(len(c), *(len(str(row[c])) for row in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(str(row[c]).ljust(widths[c]) for c in columns))
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay an exam-day traffic profile against main.app and auth.app.")
+    parser.add_argument("--main-url", help="Target a running /evaluate server (e.g. python serve.py --workers 4) instead of main.app in-process")
+    parser.add_argument("--auth-url", help="Target a running auth server (e.g. one started with --serve-auth) instead of auth.app in-process")
+    parser.add_argument("--serve-auth", type=int, metavar="PORT", help="Serve auth.app with the DB and SMTP stand-ins on this port instead of running the test")
+    parser.add_argument("--serve-auth-workers", type=int, default=1)
+    parser.add_argument("--login-users", type=int, default=200, help="Students logging in once each at exam start")
+    parser.add_argument("--login-duration", type=float, default=10, help="Seconds over which the students arrive")
+    parser.add_argument("--otp-share", type=float, default=0.1, help="Fraction of students requesting an OTP before logging in")
+    parser.add_argument("--poll-users", type=int, default=200, help="Students polling exam details")
+    parser.add_argument("--poll-duration", type=float, default=20)
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Mean seconds between polls per student")
+    parser.add_argument("--eval-users", type=int, default=20, help="Concurrent answer submissions")
+    parser.add_argument("--eval-duration", type=float, default=20)
+    parser.add_argument("--db-latency", type=float, default=0.002, help="Simulated seconds per DB call")
+    parser.add_argument("--stub-model", action="store_true", help="Replace get_similarity with a constant (API overhead only)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    if args.serve_auth:
+        import uvicorn
+        os.environ["LOADTEST_DB_LATENCY"] = str(args.db_latency)
+        uvicorn.run("loadtest:stub_auth_app", factory=True, host="127.0.0.1", port=args.serve_auth, workers=args.serve_auth_workers)
+        return
+
+    rows = asyncio.run(run(args))
+    if not rows:
+        print("No phases ran.")
+        return
+    print_report(rows)
+    if not args.auth_url:
+        print(f"Stub SMTP sent {StubSMTP.sent} emails")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+        print(f"✅ Report written to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@ from sentence_transformers import SentenceTransformer, util
 from Levenshtein import ratio
 import numpy as np
 import re
+from scoring import load_scoring_config
+from utils.text import clean_text
 
 # Load Spacy model for Named Entity Recognition (NER) and linguistic analysis
 nlp = spacy.load("en_core_web_sm")
@@ -10,84 +12,98 @@ nlp = spacy.load("en_core_web_sm")
 # Load SentenceTransformer for semantic similarity
 model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
 
+# Scoring weights and penalties (see scoring.py / calibrate.py)
+scoring_config = load_scoring_config()
+
 def get_similarity(actual_answer, student_answer):
     """Evaluate student answer using multiple dimensions of assessment."""
+    components = get_components(actual_answer, student_answer)
+    final_score, length_ratio = combine_components(components, scoring_config)
     
-    # Clean and normalize answers
-    actual_answer_clean = clean_text(actual_answer)
-    student_answer_clean = clean_text(student_answer)
-    
-    # Extract key entities and facts
-    actual_entities = extract_entities(actual_answer_clean)
-    student_entities = extract_entities(student_answer_clean)
-    
-    # Calculate factual accuracy
-    factual_accuracy = check_factual_accuracy(actual_entities, student_entities)
-    
-    # Calculate semantic similarity
-    similarity = calculate_similarity(actual_answer_clean, student_answer_clean)
+    return round(final_score, 3), generate_feedback(final_score, components["factual_accuracy"], length_ratio, components["completeness"], components["contradictions"])
+
+def get_components(actual_answer, student_answer):
+    """Compute the per-pair assessment components that the final score is built from."""
     
-    # Calculate content completeness
-    content_completeness = calculate_completeness(actual_answer_clean, student_answer_clean)
+    # Clean and normalize answers
+    actual, student = analyze_texts([clean_text(actual_answer), clean_text(student_answer)])
+    return compare_analyses(actual, student)
+
+def analyze_texts(texts):
+    """Run the per-text work (spaCy parse, embedding) once for each cleaned text, batched."""
+    texts = list(texts)
+    embeddings = model.encode(texts, convert_to_tensor=True)
+    return [
+        {
+            "word_count": len(text.split()),
+            # Extract key entities and facts
+            "entities": extract_entities(doc),
+            "concepts": extract_concepts(doc),
+            "numerical_facts": extract_numerical_facts(doc),
+            "embedding": embedding,
+        }
+        for text, doc, embedding in zip(texts, nlp.pipe(texts), embeddings)
+    ]
+
+def compare_analyses(actual, student):
+    """Compute the assessment components from two analyses returned by analyze_texts."""
+    return {
+        # Calculate factual accuracy
+        "factual_accuracy": check_factual_accuracy(actual["entities"], student["entities"]),
+        # Calculate semantic similarity
+        "similarity": calculate_similarity(actual["embedding"], student["embedding"]),
+        # Calculate content completeness
+        "completeness": calculate_completeness(actual["concepts"], student["concepts"]),
+        "word_count_actual": actual["word_count"],
+        "word_count_student": student["word_count"],
+        # Detect contradictory information
+        "contradictions": detect_contradictions(actual["numerical_facts"], student["numerical_facts"]),
+    }
+
+def get_interned_components(reference_texts, student_texts, reference_index, student_index):
+    """Compute components for interned pairs, analyzing each unique cleaned text only once."""
+    # A student answer can repeat a reference answer verbatim, so analyze the union
+    texts = list(dict.fromkeys(list(reference_texts) + list(student_texts)))
+    analyses = dict(zip(texts, analyze_texts(texts)))
+    references = [analyses[text] for text in reference_texts]
+    students = [analyses[text] for text in student_texts]
+    return [compare_analyses(references[r], students[s]) for r, s in zip(reference_index, student_index)]
+
+def combine_components(components, config):
+    """Combine assessment components into a final score; returns (score, length_ratio)."""
+    word_count_actual = components["word_count_actual"]
+    word_count_student = components["word_count_student"]
     
     # Calculate length ratio (penalize answers that are too short)
-    word_count_actual = len(actual_answer_clean.split())
-    word_count_student = len(student_answer_clean.split())
-    length_ratio = min(word_count_student / max(word_count_actual * 0.6, 1), 1.2)
-    
-    # Detect contradictory information
-    contradictions = detect_contradictions(actual_answer_clean, student_answer_clean)
+    length_ratio = min(word_count_student / max(word_count_actual * config["length_factor"], 1), config["length_cap"])
     
     # Adjust weights based on answer type and length
-    if word_count_actual <= 20:  # Short factual answers
-        factual_weight = 0.7
-        semantic_weight = 0.2
-        completeness_weight = 0.1
-    elif word_count_actual <= 50:  # Medium-length answers
-        factual_weight = 0.5
-        semantic_weight = 0.3
-        completeness_weight = 0.2
-    else:  # Long explanatory answers
-        factual_weight = 0.4
-        semantic_weight = 0.3
-        completeness_weight = 0.3
+    if word_count_actual <= config["short_max_words"]:
+        factual_weight, semantic_weight, completeness_weight = config["weights"]["short"]
+    elif word_count_actual <= config["medium_max_words"]:
+        factual_weight, semantic_weight, completeness_weight = config["weights"]["medium"]
+    else:
+        factual_weight, semantic_weight, completeness_weight = config["weights"]["long"]
     
     # Calculate final score with weighted components
     final_score = (
-        factual_weight * factual_accuracy + 
-        semantic_weight * similarity + 
-        completeness_weight * content_completeness
+        factual_weight * components["factual_accuracy"] + 
+        semantic_weight * components["similarity"] + 
+        completeness_weight * components["completeness"]
     )
     
     # Apply length penalty for very short answers
-    if length_ratio < 0.7:
+    if length_ratio < config["length_penalty_threshold"]:
         final_score *= length_ratio
     
     # Apply contradiction penalty if detected
-    if contradictions:
-        final_score *= 0.8  # 20% reduction for contradictions
+    if components["contradictions"]:
+        final_score *= config["contradiction_penalty"]
     
-    return round(final_score, 3), generate_feedback(final_score, factual_accuracy, length_ratio, content_completeness, contradictions)
-
-def clean_text(text):
-    """Clean and normalize text for better comparison."""
-    # Convert to lowercase
-    text = text.lower()
-    # Standardize units and symbols
-    text = re.sub(r'(\d+)\s*°\s*c', r'\1 degrees celsius', text)
-    text = re.sub(r'(\d+)\s*km', r'\1 kilometers', text)
-    text = re.sub(r'(\d+)\s*miles', r'\1 miles', text)
-    # Replace common abbreviations
-    text = re.sub(r'\bww2\b', 'world war 2', text)
-    text = re.sub(r'\bu\.s\.a?\b', 'united states', text)
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+    return final_score, length_ratio
 
-def extract_entities(text):
-    """Extract named entities, important nouns, numbers, and key facts from the text."""
-    doc = nlp(text)
-    
+def extract_entities(doc):
+    """Extract named entities, important nouns, numbers, and key facts from the parsed text."""
     # Extract named entities, nouns, and numbers
     entities = set()
     for token in doc:
@@ -145,32 +161,20 @@ def get_best_match(entity, student_entities):
     
     return False
 
-def calculate_similarity(actual_answer, student_answer):
-    """Compute semantic similarity between the two answers."""
-    embeddings1 = model.encode(actual_answer, convert_to_tensor=True)
-    embeddings2 = model.encode(student_answer, convert_to_tensor=True)
-    return round(util.pytorch_cos_sim(embeddings1, embeddings2)[0][0].item(), 3)
+def calculate_similarity(actual_embedding, student_embedding):
+    """Compute semantic similarity between the two answer embeddings."""
+    return round(util.pytorch_cos_sim(actual_embedding, student_embedding)[0][0].item(), 3)
 
-def calculate_completeness(actual_answer, student_answer):
-    """Assess how complete the student's answer is compared to the expected answer."""
-    # Split answers into sentences
-    actual_sentences = nlp(actual_answer).sents
-    
-    # Count key concepts in each
-    actual_doc = nlp(actual_answer)
-    student_doc = nlp(student_answer)
-    
-    # Extract key concepts (entities, main verbs, etc.)
-    actual_concepts = set()
-    for token in actual_doc:
-        if token.pos_ in ["NOUN", "PROPN", "VERB"] and not token.is_stop:
-            actual_concepts.add(token.lemma_.lower())
-    
-    student_concepts = set()
-    for token in student_doc:
+def extract_concepts(doc):
+    """Extract key concepts (entities, main verbs, etc.) from the parsed text."""
+    concepts = set()
+    for token in doc:
         if token.pos_ in ["NOUN", "PROPN", "VERB"] and not token.is_stop:
-            student_concepts.add(token.lemma_.lower())
-    
+            concepts.add(token.lemma_.lower())
+    return concepts
+
+def calculate_completeness(actual_concepts, student_concepts):
+    """Assess how complete the student's answer is compared to the expected answer."""
     # Calculate concept overlap
     if not actual_concepts:
         return 1.0
@@ -183,30 +187,26 @@ def calculate_completeness(actual_answer, student_answer):
     
     return round(matched_concepts / len(actual_concepts), 2)
 
-def detect_contradictions(actual_answer, student_answer):
-    """Detect contradictory information between the actual and student answers."""
-    # Detect numbers and their context
-    def extract_numerical_facts(text):
-        doc = nlp(text)
-        numerical_facts = {}
-        
-        for token in doc:
-            if token.like_num:
-                # Find the nearest noun to associate this number with
-                associated_noun = None
-                for potential_noun in doc:
-                    if potential_noun.pos_ in ["NOUN", "PROPN"] and abs(potential_noun.i - token.i) <= 3:
-                        associated_noun = potential_noun.lemma_.lower()
-                        break
-                
-                if associated_noun:
-                    numerical_facts[associated_noun] = token.text
-        
-        return numerical_facts
-    
-    actual_facts = extract_numerical_facts(actual_answer)
-    student_facts = extract_numerical_facts(student_answer)
+def extract_numerical_facts(doc):
+    """Detect numbers in the parsed text and the noun each one refers to."""
+    numerical_facts = {}
     
+    for token in doc:
+        if token.like_num:
+            # Find the nearest noun to associate this number with
+            associated_noun = None
+            for potential_noun in doc:
+                if potential_noun.pos_ in ["NOUN", "PROPN"] and abs(potential_noun.i - token.i) <= 3:
+                    associated_noun = potential_noun.lemma_.lower()
+                    break
+            
+            if associated_noun:
+                numerical_facts[associated_noun] = token.text
+    
+    return numerical_facts
+
+def detect_contradictions(actual_facts, student_facts):
+    """Detect contradictory information between the actual and student numerical facts."""
     # Look for contradictions (same concept, different numbers)
     contradictions = []
     for concept, actual_value in actual_facts.items():
@@ -0,0 +1,87 @@
+import argparse
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+from utils.text import clean_text
+
+SOURCE_FILES = [
+    "data/exams_training_data.csv",
+    "data/exams_training_data old.csv",
+    "data/training_data_new.csv",
+    "data/training_data_large.csv",
+]
+PREPARED_DATA_PATH = "data/prepared_data.npz"
+
+def text_hash(text):
+    """Stable hash of normalized text, used as the dedupe key."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+def intern(texts):
+    """Map texts onto a table of unique normalized texts; returns (table, indices)."""
+    clean = texts.map(clean_text)
+    codes, uniques = pd.factorize(clean.map(text_hash))
+    first = pd.Series(np.arange(len(codes))).groupby(codes).first().to_numpy()
+    table = {
+        "raw": texts.to_numpy()[first].astype(str),
+        "clean": clean.to_numpy()[first].astype(str),
+    }
+    return table, codes
+
+def prepare(files):
+    """Merge the labelled CSVs and dedupe them by normalized (reference, student) text."""
+    df = pd.concat(
+        [pd.read_csv(f, usecols=["actual_answer", "student_answer", "score"]) for f in files],
+        ignore_index=True,
+    ).dropna()
+    print(f"Loaded {len(df)} rows from {len(files)} files")
+
+    references, reference_index = intern(df["actual_answer"].astype(str))
+    students, student_index = intern(df["student_answer"].astype(str))
+
+    pairs = (
+        pd.DataFrame({"reference_index": reference_index, "student_index": student_index, "score": df["score"].to_numpy()})
+        .groupby(["reference_index", "student_index"], as_index=False)
+        .agg(score=("score", "mean"), count=("score", "size"))
+    )
+    print(f"Kept {len(pairs)} unique pairs ({len(references['raw'])} reference answers, {len(students['raw'])} student answers)")
+
+    return {
+        "files": np.array(files),
+        "reference_raw": references["raw"],
+        "reference_clean": references["clean"],
+        "student_raw": students["raw"],
+        "student_clean": students["clean"],
+        "reference_index": pairs["reference_index"].to_numpy(dtype=np.int32),
+        "student_index": pairs["student_index"].to_numpy(dtype=np.int32),
+        "score": pairs["score"].to_numpy(dtype=np.float32),
+        "count": pairs["count"].to_numpy(dtype=np.int32),
+    }
+
+def load_prepared(path=PREPARED_DATA_PATH):
+    """Load the prepared columnar data set written by prepare_data.py."""
+    with np.load(path, allow_pickle=False) as data:
+        return {name: data[name] for name in data.files}
+
+def to_frame(prepared):
+    """Expand prepared data into one row per unique pair with actual/student answer columns."""
+    return pd.DataFrame({
+        "actual_answer": prepared["reference_raw"][prepared["reference_index"]],
+        "student_answer": prepared["student_raw"][prepared["student_index"]],
+        "score": prepared["score"],
+        "count": prepared["count"],
+    })
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge and dedupe the labelled training data.")
+    parser.add_argument("files", nargs="*", default=SOURCE_FILES, help="Labelled CSV files")
+    parser.add_argument("--output", default=PREPARED_DATA_PATH, help="Prepared data file (.npz)")
+    args = parser.parse_args()
+
+    prepared = prepare(args.files)
+    np.savez_compressed(args.output, **prepared)
+    print(f"✅ Prepared data written to {args.output} ({os.path.getsize(args.output) // 1024} KB)")
+
+if __name__ == "__main__":
+    main()
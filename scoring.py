@@ -0,0 +1,31 @@
+import json
+import os
+
+# Scoring weights and penalties used by model.get_similarity;
+# overridden by the file written by calibrate.py
+SCORING_CONFIG_PATH = os.environ.get("SCORING_CONFIG_PATH", "scoring_config.json")
+
+DEFAULT_SCORING_CONFIG = {
+    "short_max_words": 20,    # Short factual answers
+    "medium_max_words": 50,   # Medium-length answers
+    # [factual, semantic, completeness] weights per answer length
+    "weights": {
+        "short": [0.7, 0.2, 0.1],
+        "medium": [0.5, 0.3, 0.2],
+        "long": [0.4, 0.3, 0.3],
+    },
+    "length_factor": 0.6,
+    "length_cap": 1.2,
+    "length_penalty_threshold": 0.7,
+    "contradiction_penalty": 0.8,
+}
+
+def load_scoring_config(path=SCORING_CONFIG_PATH):
+    """Load scoring weights from a JSON config, falling back to the defaults."""
+    config = json.loads(json.dumps(DEFAULT_SCORING_CONFIG))
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            overrides = json.load(f)
+        config["weights"].update(overrides.pop("weights", {}))
+        config.update(overrides)
+    return config
@@ -0,0 +1,16 @@
+import argparse
+import os
+
+# Launcher for the /evaluate API. Kept free of model imports so the production
+# mode doesn't load MiniLM/spaCy here only to throw them away on exec.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, help="Run the production server with this many workers (see gunicorn.conf.py)")
+    args = parser.parse_args()
+
+    if args.workers:
+        # Preloads the models once and forks workers that share them
+        os.execvp("gunicorn", ["gunicorn", "main:app", "--config", "gunicorn.conf.py", "--workers", str(args.workers)])
+
+    import uvicorn
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,6 +1,8 @@
 import pandas as pd
 import os
-from model import get_similarity
+import argparse
+from model import combine_components, get_interned_components, get_similarity, scoring_config
+from prepare_data import PREPARED_DATA_PATH, load_prepared, to_frame
 
 def load_data():
     df = pd.read_csv('data/claude_train_data.csv')
@@ -12,14 +14,33 @@ def load_data():
     print(df.head())
     return df
 
-def evaluate():
-    df = load_data()
+def evaluate_prepared():
+    # Deduplicated data written by prepare_data.py
+    data = load_prepared(PREPARED_DATA_PATH)
+    df = to_frame(data)
+    print(f"✅ Loaded {len(df)} unique pairs from {PREPARED_DATA_PATH}")
 
-    # Extract only the predicted score
-    df['predicted_score'] = df.apply(lambda row: get_similarity(row['actual_answer'], row['student_answer'])[0], axis=1)
+    # Analyze each unique cleaned text once and score the pairs by index
+    pairs = get_interned_components(
+        data["reference_clean"].tolist(), data["student_clean"].tolist(),
+        data["reference_index"], data["student_index"],
+    )
+    df['predicted_score'] = [round(combine_components(components, scoring_config)[0], 3) for components in pairs]
+    return df
+
+def evaluate(prepared=False):
+    if prepared:
+        df = evaluate_prepared()
+    else:
+        df = load_data()
+
+        # Extract only the predicted score
+        df['predicted_score'] = df.apply(lambda row: get_similarity(row['actual_answer'], row['student_answer'])[0], axis=1)
 
     # Display results
     print(df[['actual_answer', 'student_answer', 'score', 'predicted_score']].head())
 
 if __name__ == "__main__":
-    evaluate()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--prepared", action="store_true", help=f"Evaluate on {PREPARED_DATA_PATH} instead of data/claude_train_data.csv")
+    evaluate(parser.parse_args().prepared)
@@ -0,0 +1,16 @@
+import re
+
+def clean_text(text):
+    """Clean and normalize text for better comparison."""
+    # Convert to lowercase
+    text = text.lower()
+    # Standardize units and symbols
+    text = re.sub(r'(\d+)\s*°\s*c', r'\1 degrees celsius', text)
+    text = re.sub(r'(\d+)\s*km', r'\1 kilometers', text)
+    text = re.sub(r'(\d+)\s*miles', r'\1 miles', text)
+    # Replace common abbreviations
+    text = re.sub(r'\bww2\b', 'world war 2', text)
+    text = re.sub(r'\bu\.s\.a?\b', 'united states', text)
+    # Remove extra whitespace
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text